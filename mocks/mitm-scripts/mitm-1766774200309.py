@@ -9,6 +9,11 @@ This proxy is PERMISSIVE by default:
 """
 
 from mitmproxy import http
+import logging
+
+# Per-flow lines go to the shared "mitm_mock" logger at DEBUG
+# (mitmdump --set termlog_verbosity=debug)
+log = logging.getLogger("mitm_mock")
 
 # Target domains to intercept
 TARGET_DOMAINS = ["jsonplaceholder.typicode.com"]
@@ -20,43 +25,66 @@ MOCKOON_PORT = 3001
 # Verbose logging
 VERBOSE = True
 
+# Reversed-label trie of TARGET_DOMAINS (com -> typicode -> jsonplaceholder),
+# with a None key marking the end of a domain
+_DOMAIN_TRIE = {}
+for _domain in TARGET_DOMAINS:
+    _node = _DOMAIN_TRIE
+    for _label in reversed(_domain.lower().split(".")):
+        _node = _node.setdefault(_label, {})
+    _node[None] = True
+
+def _host_matches(host: str) -> bool:
+    """
+    Check whether host is a target domain or one of its subdomains.
+    Walks the trie from the TLD inward, once per host.
+    """
+    node = _DOMAIN_TRIE
+    for label in reversed(host.lower().split(".")):
+        node = node.get(label)
+        if node is None:
+            return False
+        if None in node:
+            return True
+    return False
+
 def request(flow: http.HTTPFlow) -> None:
     """
     Intercept requests and redirect to Mockoon if domain matches.
     Pass through everything else unchanged.
     """
-    host = flow.request.pretty_host
+    # Bind the request once instead of going through flow.request each time
+    req = flow.request
+    host = req.pretty_host
 
     # Android emulator special IP: rewrite 10.0.2.2 to localhost
     # From emulator's perspective, 10.0.2.2 is the host machine
     # But from host machine's perspective, we need to use localhost
     if host == "10.0.2.2":
-        flow.request.host = "localhost"
+        req.host = "localhost"
         if VERBOSE:
-            print(f"🔄 Rewrote host: 10.0.2.2 → localhost (port: {flow.request.port})")
+            log.debug("🔄 Rewrote host: 10.0.2.2 → localhost (port: %s)", req.port)
 
     # Check if this is a target domain we should mock
-    should_mock = any(domain in host for domain in TARGET_DOMAINS)
+    should_mock = _host_matches(host)
 
     if should_mock:
-        original_url = f"{flow.request.scheme}://{host}{flow.request.path}"
-
         if VERBOSE:
-            print(f"🎭 Intercepting: {flow.request.method} {original_url}")
+            log.debug("🎭 Intercepting: %s %s://%s%s", req.method, req.scheme, host, req.path)
 
         # Rewrite request to point to Mockoon
-        flow.request.scheme = "http"
-        flow.request.host = MOCKOON_HOST
-        flow.request.port = MOCKOON_PORT
+        req.scheme = "http"
+        req.host = MOCKOON_HOST
+        req.port = MOCKOON_PORT
 
         # Keep the original path and query string - Mockoon will match based on path
 
         # Add headers to track that this was proxied (useful for debugging)
-        flow.request.headers["X-Mitmproxy-Intercepted"] = "true"
-        flow.request.headers["X-Original-Host"] = host
+        req.headers["X-Mitmproxy-Intercepted"] = "true"
+        req.headers["X-Original-Host"] = host
 
         if VERBOSE:
-            print(f"   → Redirected to: http://{MOCKOON_HOST}:{MOCKOON_PORT}{flow.request.path}")
+            log.debug("   → Redirected to: http://%s:%s%s", MOCKOON_HOST, MOCKOON_PORT, req.path)
     # Note: No else clause - all non-target requests pass through transparently
     # This is critical for app initialization, Metro bundler, etc.
 
@@ -64,5 +92,6 @@ def response(flow: http.HTTPFlow) -> None:
     """
     Log responses for intercepted requests
     """
-    if VERBOSE and any(domain in flow.request.pretty_host for domain in TARGET_DOMAINS):
-        print(f"   ← Response: {flow.response.status_code}")
+    # request() tags every flow it redirects, so no need to re-match the host
+    if VERBOSE and "X-Mitmproxy-Intercepted" in flow.request.headers:
+        log.debug("   ← Response: %s", flow.response.status_code)
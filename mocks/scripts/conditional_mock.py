@@ -13,25 +13,38 @@ Useful for:
 """
 
 from mitmproxy import http
+import logging
 import re
 
 
+log = logging.getLogger("mitm_mock")
+
 MOCKOON_HOST = "mockoon"
 MOCKOON_PORT = 3000
 
+# Request headers that can switch a flow to Mockoon (header lookups are
+# case-insensitive in mitmproxy)
+_TRIGGER_HEADERS = ("X-Mock-Mode", "X-Test-Scenario")
+
 
 def request(flow: http.HTTPFlow) -> None:
     """Route to Mockoon based on conditions"""
+    headers = flow.request.headers
+    query = flow.request.query
+
+    # Fast path: most flows carry none of the mock triggers
+    if "mock" not in query and not any(name in headers for name in _TRIGGER_HEADERS):
+        return
 
     # Check for mock mode header
-    mock_mode = flow.request.headers.get("X-Mock-Mode", "").lower()
+    mock_mode = headers.get("X-Mock-Mode", "").lower()
 
     # Check for mock query parameter
-    has_mock_param = "mock" in flow.request.query and \
-                     flow.request.query.get("mock", "").lower() in ["true", "1", "yes"]
+    has_mock_param = "mock" in query and \
+                     query.get("mock", "").lower() in ["true", "1", "yes"]
 
     # Check for test scenario header (can be used in Mockoon routing)
-    test_scenario = flow.request.headers.get("X-Test-Scenario", "")
+    test_scenario = headers.get("X-Test-Scenario", "")
 
     should_mock = False
 
@@ -43,7 +56,7 @@ def request(flow: http.HTTPFlow) -> None:
     elif has_mock_param:
         should_mock = True
         # Remove mock parameter from query string to avoid issues
-        flow.request.query.pop("mock", None)
+        query.pop("mock", None)
     elif test_scenario:
         # If test scenario is specified, route to Mockoon
         # Mockoon can use this header in response rules
@@ -59,10 +72,11 @@ def request(flow: http.HTTPFlow) -> None:
         if test_scenario:
             flow.request.headers["X-Mockoon-Scenario"] = test_scenario
 
-        log_msg = f"[MOCK] {flow.request.method} {flow.request.path} → Mockoon"
         if test_scenario:
-            log_msg += f" (scenario: {test_scenario})"
-        print(log_msg)
+            log.debug("[MOCK] %s %s → Mockoon (scenario: %s)",
+                      flow.request.method, flow.request.path, test_scenario)
+        else:
+            log.debug("[MOCK] %s %s → Mockoon", flow.request.method, flow.request.path)
 
         flow.request.headers["X-Mocked-By"] = "mitmproxy-conditional"
 
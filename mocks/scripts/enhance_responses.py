@@ -11,12 +11,51 @@ Useful for:
 """
 
 from mitmproxy import http
+import functools
+import logging
+import time
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 
 
 MOCKOON_URL = "http://mockoon:3000"
 
+log = logging.getLogger("mitm_mock")
+
+# Shared session so connections to Mockoon are kept alive across flows
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=256, max_retries=0))
+
+# How long (seconds) enhancement data for a path is reused before refetching
+ENHANCE_CACHE_TTL = 30
+
+
+@functools.lru_cache(maxsize=1024)
+def _fetch_enhancement_cached(bucket: int, path: str):
+    """
+    Fetch enhancement data for path from Mockoon
+
+    bucket is part of the cache key only, so entries expire when
+    the TTL bucket rolls over. Returns None if Mockoon has no data.
+    """
+    # Use /enhance endpoint with original path as param
+    enhance_response = _SESSION.get(
+        f"{MOCKOON_URL}/enhance?path={path}",
+        headers={"X-Original-Path": path},
+        timeout=2
+    )
+
+    if not enhance_response.ok:
+        return None
+
+    return orjson.loads(enhance_response.content)
+
+
+def _fetch_enhancement(path: str):
+    """Get (possibly cached) enhancement data for path"""
+    return _fetch_enhancement_cached(int(time.monotonic() // ENHANCE_CACHE_TTL), path)
+
 
 def response(flow: http.HTTPFlow) -> None:
     """Enhance real API responses with mock data"""
@@ -26,41 +65,48 @@ def response(flow: http.HTTPFlow) -> None:
         return
 
     # Check if enhancement is requested
-    enhance = flow.request.headers.get("X-Enhance-Response", "").lower() == "true"
-    if not enhance:
+    if flow.request.headers.get("X-Enhance-Response", "").lower() != "true":
+        return
+
+    # Only JSON bodies can be merged
+    if "json" not in flow.response.headers.get("content-type", "").lower():
         return
 
+    path = flow.request.path
+
+    # Parse real response straight from bytes; leave non-JSON bodies alone
     try:
-        # Parse real response
-        real_data = json.loads(flow.response.text)
+        real_data = orjson.loads(flow.response.content)
+    except orjson.JSONDecodeError:
+        return
 
+    try:
         # Try to get enhancement data from Mockoon
-        # Use /enhance endpoint with original path as param
-        enhance_url = f"{MOCKOON_URL}/enhance?path={flow.request.path}"
-
-        enhance_response = requests.get(
-            enhance_url,
-            headers={"X-Original-Path": flow.request.path},
-            timeout=2
-        )
-
-        if enhance_response.ok:
-            enhance_data = enhance_response.json()
-
-            # Merge enhancement data
-            if isinstance(real_data, dict) and isinstance(enhance_data, dict):
-                # Deep merge dictionaries
-                enhanced = {**real_data, **enhance_data}
-                flow.response.text = json.dumps(enhanced)
-                flow.response.headers["X-Enhanced"] = "true"
-                print(f"[ENHANCED] {flow.request.path} with mock data")
-            elif isinstance(real_data, list) and "items" in enhance_data:
-                # Add mock items to list
-                real_data.extend(enhance_data["items"])
-                flow.response.text = json.dumps(real_data)
-                flow.response.headers["X-Enhanced"] = "true"
-                print(f"[ENHANCED] {flow.request.path} with {len(enhance_data['items'])} mock items")
+        enhance_data = _fetch_enhancement(path)
+        if not enhance_data:
+            return
+
+        # Merge enhancement data, skipping the re-serialize when it would
+        # not change the body
+        if isinstance(real_data, dict) and isinstance(enhance_data, dict):
+            if all(k in real_data and real_data[k] == v for k, v in enhance_data.items()):
+                return
+
+            # Merge in place; real_data is a throwaway parse result
+            real_data.update(enhance_data)
+            flow.response.content = orjson.dumps(real_data)
+            flow.response.headers["X-Enhanced"] = "true"
+            log.debug("[ENHANCED] %s with mock data", path)
+        elif isinstance(real_data, list) and "items" in enhance_data:
+            if not enhance_data["items"]:
+                return
+
+            # Add mock items to list
+            real_data.extend(enhance_data["items"])
+            flow.response.content = orjson.dumps(real_data)
+            flow.response.headers["X-Enhanced"] = "true"
+            log.debug("[ENHANCED] %s with %d mock items", path, len(enhance_data["items"]))
 
     except Exception as e:
-        print(f"[ENHANCE ERROR] Failed to enhance {flow.request.path}: {e}")
+        log.warning("[ENHANCE ERROR] Failed to enhance %s: %s", path, e)
         # Keep original response on error
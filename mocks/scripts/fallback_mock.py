@@ -10,15 +10,31 @@ Useful for:
 """
 
 from mitmproxy import http
-import requests
-import json
+import httpx
+import logging
 
 
 MOCKOON_URL = "http://mockoon:3000"
 FALLBACK_STATUS_CODES = [500, 502, 503, 504]  # Server errors
 
+log = logging.getLogger("mitm_mock")
 
-def response(flow: http.HTTPFlow) -> None:
+# Shared async client so fallback requests run on mitmproxy's event loop
+# without blocking other flows, and connections to Mockoon are kept alive
+_CLIENT = httpx.AsyncClient(
+    timeout=5.0,
+    verify=False,
+    limits=httpx.Limits(max_connections=256, max_keepalive_connections=64)
+)
+
+# Request headers that must not be forwarded to Mockoon
+_SKIP_REQUEST_HEADERS = frozenset(("host",))
+
+# Mockoon response headers that must not be copied onto the flow
+_SKIP_RESPONSE_HEADERS = frozenset(("content-encoding", "transfer-encoding", "content-length"))
+
+
+async def response(flow: http.HTTPFlow) -> None:
     """
     Check if real API returned an error, fallback to Mockoon if so
     """
@@ -26,48 +42,52 @@ def response(flow: http.HTTPFlow) -> None:
     if flow.response.status_code not in FALLBACK_STATUS_CODES:
         return
 
-    print(f"[FALLBACK] Real API error {flow.response.status_code} for {flow.request.path}")
+    log.debug("[FALLBACK] Real API error %s for %s", flow.response.status_code, flow.request.path)
 
     try:
-        # Build Mockoon URL
+        # Build Mockoon URL (flow.request.path already carries the
+        # original, correctly encoded query string)
         mock_url = f"{MOCKOON_URL}{flow.request.path}"
-        if flow.request.query:
-            mock_url += "?" + str(flow.request.query)
 
-        # Prepare request data
-        headers = dict(flow.request.headers)
-        # Remove headers that shouldn't be forwarded
-        headers.pop("Host", None)
+        # Forward headers as (name, value) pairs so repeated headers survive
+        headers = [
+            (key, value)
+            for key, value in flow.request.headers.items(multi=True)
+            if key.lower() not in _SKIP_REQUEST_HEADERS
+        ]
 
         # Make request to Mockoon
-        mock_response = requests.request(
+        mock_response = await _CLIENT.request(
             method=flow.request.method,
             url=mock_url,
             headers=headers,
-            data=flow.request.content,
-            timeout=5,
-            verify=False
+            content=flow.request.content
         )
 
         # Check if Mockoon has a mock for this endpoint
         if mock_response.status_code == 404:
-            print(f"[FALLBACK] Mockoon has no mock for {flow.request.path}, keeping real error")
+            log.debug("[FALLBACK] Mockoon has no mock for %s, keeping real error", flow.request.path)
             return
 
         # Replace response with mock
         flow.response.status_code = mock_response.status_code
-        flow.response.reason = mock_response.reason
+        flow.response.reason = mock_response.reason_phrase
         flow.response.content = mock_response.content
 
         # Update headers
         for key, value in mock_response.headers.items():
-            if key.lower() not in ["content-encoding", "transfer-encoding", "content-length"]:
+            if key.lower() not in _SKIP_RESPONSE_HEADERS:
                 flow.response.headers[key] = value
 
         # Add fallback indicator
         flow.response.headers["X-Fallback-Mock"] = "true"
-        print(f"[FALLBACK] Returned mock response ({mock_response.status_code}) for {flow.request.path}")
+        log.debug("[FALLBACK] Returned mock response (%s) for %s", mock_response.status_code, flow.request.path)
 
     except Exception as e:
-        print(f"[FALLBACK] Failed to get mock response: {e}")
+        log.warning("[FALLBACK] Failed to get mock response: %s", e)
         # Keep original error response
+
+
+async def done():
+    """Called when mitmproxy shuts down"""
+    await _CLIENT.aclose()
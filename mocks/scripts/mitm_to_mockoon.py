@@ -13,12 +13,24 @@ The input file should be in JSONL format (one JSON object per line)
 as created by selective_record.py.
 """
 
-import json
+import orjson
+import os
+import re
 import sys
 import uuid
 from pathlib import Path
-from typing import List, Dict, Any
-from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+
+# Headers to exclude (connection-specific, not useful in mocks)
+_EXCLUDE_HEADERS = frozenset((
+    'content-length', 'transfer-encoding', 'connection',
+    'keep-alive', 'host', 'content-encoding'
+))
+
+# Path segments that look like IDs: all digits, or long and containing
+# a dash (UUID-like)
+_ID_RE = re.compile(r'/(?:\d+|(?=[^/]*-)[^/]{31,})(?=/|$)')
 
 
 def generate_uuid() -> str:
@@ -26,22 +38,24 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def generate_uuids(count: int) -> List[str]:
+    """Generate several UUID4s for Mockoon entities from one random draw"""
+    buf = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=buf[i:i + 16], version=4))
+        for i in range(0, 16 * count, 16)
+    ]
+
+
 def clean_headers(headers: Dict[str, str]) -> List[Dict[str, str]]:
     """
     Convert headers dict to Mockoon format and filter out problematic ones
     """
-    # Headers to exclude (connection-specific, not useful in mocks)
-    exclude_headers = {
-        'content-length', 'transfer-encoding', 'connection',
-        'keep-alive', 'host', 'content-encoding'
-    }
-
-    result = []
-    for key, value in headers.items():
-        if key.lower() not in exclude_headers:
-            result.append({"key": key, "value": value})
-
-    return result
+    return [
+        {"key": key, "value": value}
+        for key, value in headers.items()
+        if key.lower() not in _EXCLUDE_HEADERS
+    ]
 
 
 def determine_endpoint(path: str) -> str:
@@ -52,19 +66,7 @@ def determine_endpoint(path: str) -> str:
     """
     # Simple heuristic: if segment looks like ID, convert to param
     # This is basic - might need improvement for your use case
-    parts = path.split('/')
-    result = []
-
-    for part in parts:
-        if not part:
-            continue
-        # If part is numeric or UUID-like, make it a param
-        if part.isdigit() or '-' in part and len(part) > 30:
-            result.append(':id')
-        else:
-            result.append(part)
-
-    return '/' + '/'.join(result) if result else path
+    return _ID_RE.sub('/:id', path)
 
 
 def get_content_type(headers: Dict[str, str]) -> str:
@@ -75,69 +77,38 @@ def get_content_type(headers: Dict[str, str]) -> str:
     return 'application/json'
 
 
-def convert_recordings_to_mockoon(
-    input_file: str,
-    output_file: str,
-    name: str = "Recorded API Mocks"
-) -> None:
+def build_routes(grouped: Dict[Tuple[str, str], list]) -> Iterator[Dict[str, Any]]:
     """
-    Convert mitmproxy recordings to Mockoon format
+    Build Mockoon routes one at a time from grouped recordings
 
     Args:
-        input_file: Path to JSONL file with recordings
-        output_file: Path for output Mockoon JSON config
-        name: Name for the Mockoon environment
+        grouped: (method, path) -> [first recording, recording count]
     """
+    # Two UUIDs per route: route + response
+    uuids = iter(generate_uuids(2 * len(grouped)))
 
-    # Read all recordings
-    recordings = []
-    with open(input_file, 'r') as f:
-        for line in f:
-            if line.strip():
-                recordings.append(json.loads(line))
-
-    print(f"Read {len(recordings)} recordings from {input_file}")
-
-    # Group recordings by method+path to handle duplicates
-    grouped = defaultdict(list)
-    for rec in recordings:
-        method = rec['request']['method'].lower()
-        path = rec['request']['path']
-        key = f"{method}:{path}"
-        grouped[key].append(rec)
-
-    print(f"Grouped into {len(grouped)} unique endpoints")
-
-    # Convert to Mockoon routes
-    routes = []
-
-    for key, recs in grouped.items():
-        method, path = key.split(':', 1)
-
-        # Use first recording as template
-        first_rec = recs[0]
-
+    for (method, path), (first_rec, count) in grouped.items():
         # Create endpoint (convert IDs to params if needed)
         endpoint = determine_endpoint(path).lstrip('/')
 
         # Create response body
         response_body = first_rec['response']['body']
         if isinstance(response_body, dict):
-            response_body = json.dumps(response_body, indent=2)
+            response_body = orjson.dumps(response_body, option=orjson.OPT_INDENT_2).decode()
 
         # Create route
         route = {
-            "uuid": generate_uuid(),
+            "uuid": next(uuids),
             "documentation": f"Recorded: {method.upper()} {path}",
             "method": method,
             "endpoint": endpoint,
             "responses": [
                 {
-                    "uuid": generate_uuid(),
+                    "uuid": next(uuids),
                     "body": response_body,
                     "latency": 0,
                     "statusCode": first_rec['response']['status_code'],
-                    "label": f"Recorded response ({len(recs)} similar)",
+                    "label": f"Recorded response ({count} similar)",
                     "headers": clean_headers(first_rec['response']['headers']),
                     "bodyType": "INLINE",
                     "filePath": "",
@@ -154,7 +125,74 @@ def convert_recordings_to_mockoon(
             "responseMode": None
         }
 
-        routes.append(route)
+        yield route
+
+
+def write_environment(
+    output_file: str,
+    mockoon_config: Dict[str, Any],
+    routes: Iterable[Dict[str, Any]]
+) -> int:
+    """
+    Write a Mockoon environment, streaming routes into its "routes" array
+
+    Each route is serialized and written as soon as it is produced, so
+    the full route list is never held in memory. Returns the number of
+    routes written.
+    """
+    envelope = orjson.dumps({**mockoon_config, "routes": []}, option=orjson.OPT_INDENT_2)
+    head, tail = envelope.split(b'"routes": []', 1)
+
+    count = 0
+    with open(output_file, 'wb') as f:
+        f.write(head)
+        f.write(b'"routes": [')
+        for route in routes:
+            f.write(b',\n    ' if count else b'\n    ')
+            # Re-indent to sit inside the envelope (JSON strings never
+            # contain raw newlines, so this only touches formatting)
+            f.write(orjson.dumps(route, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n    '))
+            count += 1
+        f.write(b'\n  ]' if count else b']')
+        f.write(tail)
+
+    return count
+
+
+def convert_recordings_to_mockoon(
+    input_file: str,
+    output_file: str,
+    name: str = "Recorded API Mocks"
+) -> None:
+    """
+    Convert mitmproxy recordings to Mockoon format
+
+    Args:
+        input_file: Path to JSONL file with recordings
+        output_file: Path for output Mockoon JSON config
+        name: Name for the Mockoon environment
+    """
+
+    # Read recordings and group them by method+path in a single pass.
+    # Only the first recording of each group is kept (it is used as the
+    # template) along with a count of how many similar ones were seen.
+    grouped = {}
+    total = 0
+    with open(input_file, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = orjson.loads(line)
+            total += 1
+            key = (rec['request']['method'].lower(), rec['request']['path'])
+            group = grouped.get(key)
+            if group is None:
+                grouped[key] = [rec, 1]
+            else:
+                group[1] += 1
+
+    print(f"Read {total} recordings from {input_file}")
+    print(f"Grouped into {len(grouped)} unique endpoints")
 
     # Create Mockoon environment
     mockoon_config = {
@@ -166,7 +204,7 @@ def convert_recordings_to_mockoon(
         "port": 3000,
         "hostname": "0.0.0.0",
         "folders": [],
-        "routes": routes,
+        "routes": [],
         "proxyMode": False,
         "proxyHost": "",
         "proxyRemovePrefix": False,
@@ -203,11 +241,10 @@ def convert_recordings_to_mockoon(
         "data": []
     }
 
-    # Write output
-    with open(output_file, 'w') as f:
-        json.dump(mockoon_config, f, indent=2)
+    # Write output, building routes as they are written
+    route_count = write_environment(output_file, mockoon_config, build_routes(grouped))
 
-    print(f"\nConverted {len(routes)} routes to Mockoon format")
+    print(f"\nConverted {route_count} routes to Mockoon format")
     print(f"Output written to: {output_file}")
     print("\nNext steps:")
     print("1. Open this file in Mockoon desktop app")
@@ -10,8 +10,13 @@ to the real API.
 """
 
 from mitmproxy import http
+import logging
 import re
 
+# Per-flow messages are logged at DEBUG with lazy %-formatting, so nothing
+# is formatted unless the level is enabled (mitmdump --set termlog_verbosity=debug)
+log = logging.getLogger("mitm_mock")
+
 # Configuration
 MOCKOON_HOST = "mockoon"
 MOCKOON_PORT = 3000
@@ -34,6 +39,12 @@ REAL_ENDPOINTS = [
     r'^/api/v1/metrics$',
 ]
 
+# Fuse each pattern list into a single alternation compiled once at load,
+# so every request is checked with one regex scan instead of a Python loop.
+# An empty list compiles to a pattern that never matches.
+_MOCK_RE = re.compile("|".join("(?:%s)" % p for p in MOCK_ENDPOINTS) or r"(?!)")
+_REAL_RE = re.compile("|".join("(?:%s)" % p for p in REAL_ENDPOINTS) or r"(?!)")
+
 
 def should_mock(path: str) -> bool:
     """
@@ -45,17 +56,8 @@ def should_mock(path: str) -> bool:
     Returns:
         True if the path should be mocked, False otherwise
     """
-    # First check if it's explicitly set to use real API
-    for pattern in REAL_ENDPOINTS:
-        if re.match(pattern, path):
-            return False
-
-    # Then check if it matches a mock pattern
-    for pattern in MOCK_ENDPOINTS:
-        if re.match(pattern, path):
-            return True
-
-    return False
+    # Real API exceptions take precedence over mock patterns
+    return not _REAL_RE.match(path) and bool(_MOCK_RE.match(path))
 
 
 def request(flow: http.HTTPFlow) -> None:
@@ -78,13 +80,13 @@ def request(flow: http.HTTPFlow) -> None:
         flow.request.port = MOCKOON_PORT
 
         # Log the routing decision
-        print(f"[MOCK] {flow.request.method} {request_path} → Mockoon (was: {original_host})")
+        log.debug("[MOCK] %s %s → Mockoon (was: %s)", flow.request.method, request_path, original_host)
 
         # Add header to track routing (useful for debugging)
         flow.request.headers["X-Mocked-By"] = "mitmproxy-mockoon"
     else:
         # Let it pass to real API
-        print(f"[REAL] {flow.request.method} {request_path} → Real API")
+        log.debug("[REAL] %s %s → Real API", flow.request.method, request_path)
 
 
 def response(flow: http.HTTPFlow) -> None:
@@ -94,4 +96,5 @@ def response(flow: http.HTTPFlow) -> None:
     # Add header to indicate if response was mocked
     if "X-Mocked-By" in flow.request.headers:
         flow.response.headers["X-Mocked-Response"] = "true"
-        print(f"[MOCK RESPONSE] {flow.request.method} {flow.request.path} - Status: {flow.response.status_code}")
+        log.debug("[MOCK RESPONSE] %s %s - Status: %s",
+                  flow.request.method, flow.request.path, flow.response.status_code)
@@ -8,8 +8,10 @@ The recordings can be converted to Mockoon format later.
 """
 
 from mitmproxy import http, ctx
-import json
+import logging
+import orjson
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -29,43 +31,66 @@ EXCLUDE_PATTERNS = [
     r'.*metrics.*',
 ]
 
+# Pattern lists fused into single alternations, compiled once at load
+_EXCLUDE_RE = re.compile("|".join("(?:%s)" % p for p in EXCLUDE_PATTERNS) or r"(?!)", re.IGNORECASE)
+_RECORD_RE = re.compile("|".join("(?:%s)" % p for p in RECORD_PATTERNS) or r"(?!)")
+
 RECORDINGS_FILE = "/home/mitmproxy/.mitmproxy/recordings.jsonl"
 
+log = logging.getLogger("mitm_mock")
+
+# Flush buffered recordings to disk after this many entries, or this many
+# seconds after the first unflushed one, whichever comes first
+FLUSH_EVERY = 50
+FLUSH_INTERVAL = 1.0
+
+# Keep one buffered handle open for the whole session instead of
+# reopening the recordings file for every flow
+Path(RECORDINGS_FILE).parent.mkdir(parents=True, exist_ok=True)
+_FH = open(RECORDINGS_FILE, "ab", buffering=1 << 20)
+_FH_LOCK = threading.Lock()
+_pending = 0
+_flush_timer = None
+
 
 def should_record(path: str) -> bool:
     """Check if this path should be recorded"""
-    # Check exclusions first
-    for pattern in EXCLUDE_PATTERNS:
-        if re.match(pattern, path, re.IGNORECASE):
-            return False
+    # Exclusions take precedence over record patterns
+    return not _EXCLUDE_RE.match(path) and bool(_RECORD_RE.match(path))
 
-    # Check if matches record patterns
-    for pattern in RECORD_PATTERNS:
-        if re.match(pattern, path):
-            return True
 
-    return False
+def _flush() -> None:
+    """Write buffered recordings to disk"""
+    global _pending, _flush_timer
+
+    with _FH_LOCK:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        if not _FH.closed:
+            _FH.flush()
+        _pending = 0
 
 
 def response(flow: http.HTTPFlow) -> None:
     """Record responses for matching endpoints"""
+    global _pending, _flush_timer
+
     if not should_record(flow.request.path):
         return
 
     try:
-        # Parse request body if JSON
-        request_body = flow.request.text
+        # Parse request body if JSON, decoding to text only when it isn't
         try:
-            request_body = json.loads(request_body)
-        except:
-            pass
+            request_body = orjson.loads(flow.request.content)
+        except orjson.JSONDecodeError:
+            request_body = flow.request.text
 
         # Parse response body if JSON
-        response_body = flow.response.text
         try:
-            response_body = json.loads(response_body)
-        except:
-            pass
+            response_body = orjson.loads(flow.response.content)
+        except orjson.JSONDecodeError:
+            response_body = flow.response.text
 
         # Create recording entry
         recording = {
@@ -86,18 +111,30 @@ def response(flow: http.HTTPFlow) -> None:
         }
 
         # Append to recordings file (JSONL format - one JSON per line)
-        recordings_path = Path(RECORDINGS_FILE)
-        recordings_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(recordings_path, "a") as f:
-            f.write(json.dumps(recording) + "\n")
-
-        print(f"[RECORDED] {flow.request.method} {flow.request.path} (status: {flow.response.status_code})")
+        line = orjson.dumps(recording) + b"\n"
+        with _FH_LOCK:
+            _FH.write(line)
+            _pending += 1
+            flush_now = _pending >= FLUSH_EVERY
+            if not flush_now and _flush_timer is None:
+                # Bound how long a recording can sit in the buffer, so the
+                # file stays usable while mitmdump is still running
+                _flush_timer = threading.Timer(FLUSH_INTERVAL, _flush)
+                _flush_timer.daemon = True
+                _flush_timer.start()
+
+        if flush_now:
+            _flush()
+
+        log.debug("[RECORDED] %s %s (status: %s)", flow.request.method, flow.request.path, flow.response.status_code)
 
     except Exception as e:
-        print(f"[RECORD ERROR] Failed to record {flow.request.path}: {e}")
+        log.warning("[RECORD ERROR] Failed to record %s: %s", flow.request.path, e)
 
 
 def done():
     """Called when mitmproxy shuts down"""
+    _flush()
+    with _FH_LOCK:
+        _FH.close()
     ctx.log.info(f"Recordings saved to {RECORDINGS_FILE}")
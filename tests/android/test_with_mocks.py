@@ -8,94 +8,172 @@ This demonstrates different approaches to testing with mocks:
 """
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException
 import requests
 
 
-@pytest.fixture
-def mockoon_url():
-    """Direct Mockoon URL"""
-    return "http://mockoon:3000"
+APPIUM_ANDROID_URL = "http://appium-android:4723"
+MOCKOON_URL = "http://mockoon:3000"
 
+# App under test
+# TODO: Update with your app details
+APP_PACKAGE = "com.example.yourapp"
+APP_ACTIVITY = ".MainActivity"
 
-@pytest.fixture
-def proxy_config():
-    """mitmproxy configuration"""
-    return {
-        "proxyType": "manual",
-        "httpProxy": "mitmproxy:8080",
-        "sslProxy": "mitmproxy:8080"
-    }
+# mitmproxy configuration
+PROXY_CONFIG = {
+    "proxyType": "manual",
+    "httpProxy": "mitmproxy:8080",
+    "sslProxy": "mitmproxy:8080"
+}
 
 
-@pytest.fixture
-def driver_direct_mock():
-    """
-    Driver configured to use Mockoon directly (no proxy)
-    Fastest option, full control
-    """
+def _base_options():
+    """UiAutomator2 options shared by every driver in this file"""
     options = UiAutomator2Options()
     options.platform_name = "Android"
     options.automation_name = "UiAutomator2"
     options.device_name = "Android Device"
-
-    # Configure app to use Mockoon URL
-    # This assumes your app supports API URL configuration
-    options.set_capability("appActivity", ".MainActivity")
-    options.set_capability("optionalIntentArguments",
-                          "--es api_url http://mockoon:3000")
-
+    options.app_package = APP_PACKAGE
+    options.app_activity = APP_ACTIVITY
     options.no_reset = True
     options.new_command_timeout = 300
+    return options
 
-    driver = webdriver.Remote(
-        "http://appium-android:4723",
-        options=options
-    )
+
+# Driver options are built once at import; the fixtures only open sessions
+
+# Configure app to use Mockoon URL
+# This assumes your app supports API URL configuration
+_DIRECT_OPTIONS = _base_options()
+_DIRECT_OPTIONS.set_capability("optionalIntentArguments",
+                               f"--es api_url {MOCKOON_URL}")
+
+# Set proxy
+_PROXY_OPTIONS = _base_options()
+_PROXY_OPTIONS.set_capability("proxy", PROXY_CONFIG)
+
+# "mobile: startActivity" arguments that relaunch the app the same way
+# each session launched it (stop force-stops the running app first)
+_DIRECT_LAUNCH = {
+    "component": f"{APP_PACKAGE}/{APP_ACTIVITY}",
+    "extras": [["s", "api_url", MOCKOON_URL]],
+    "stop": True,
+}
+_PROXY_LAUNCH = {
+    "component": f"{APP_PACKAGE}/{APP_ACTIVITY}",
+    "stop": True,
+}
+
+
+# Poll interval (seconds) for explicit waits. Selenium's default of 0.5s
+# leaves most of each wait idle after the element is already there; Mockoon
+# answers in milliseconds, so UI steps settle well below that.
+WAIT_POLL_FREQUENCY = 0.05
+
+
+@pytest.fixture(scope="session")
+def mockoon_url():
+    """Direct Mockoon URL"""
+    return MOCKOON_URL
+
+
+@pytest.fixture(scope="session")
+def proxy_config():
+    """mitmproxy configuration"""
+    return PROXY_CONFIG
+
+
+# Appium sessions are class-scoped: both drivers use the same Appium server,
+# which runs with session-override, so opening one session kills the other.
+# Each test class uses a single driver, so only one is open at a time.
+
+@pytest.fixture(scope="class")
+def _direct_mock_session():
+    """Appium session with the app pointed at Mockoon"""
+    driver = webdriver.Remote(APPIUM_ANDROID_URL, options=_DIRECT_OPTIONS)
+
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(scope="class")
+def _proxy_session():
+    """Appium session with traffic routed through mitmproxy"""
+    driver = webdriver.Remote(APPIUM_ANDROID_URL, options=_PROXY_OPTIONS)
 
     yield driver
     driver.quit()
 
 
+def _is_last_in_class(item):
+    """True if the next test to run belongs to a different class"""
+    items = item.session.items
+    index = items.index(item)
+    return index + 1 == len(items) or items[index + 1].parent is not item.parent
+
+
+def _relaunch_app(request, driver, launch):
+    """
+    Restart the app under test so the next test starts from launch
+
+    Skipped after the last test of a class, whose session is quit next.
+    """
+    if not _is_last_in_class(request.node):
+        driver.execute_script("mobile: startActivity", launch)
+
+
 @pytest.fixture
-def driver_with_proxy(proxy_config):
+def driver_direct_mock(request, _direct_mock_session):
     """
-    Driver configured to use mitmproxy
-    Allows selective mocking and recording
+    Driver configured to use Mockoon directly (no proxy)
+    Fastest option, full control
+
+    The tests of a class share one Appium session; the app is relaunched
+    with the Mockoon URL after each test instead of starting a new session.
     """
-    options = UiAutomator2Options()
-    options.platform_name = "Android"
-    options.automation_name = "UiAutomator2"
-    options.device_name = "Android Device"
+    yield _direct_mock_session
+    _relaunch_app(request, _direct_mock_session, _DIRECT_LAUNCH)
 
-    # Set proxy
-    options.set_capability("proxy", proxy_config)
 
-    options.no_reset = True
-    options.new_command_timeout = 300
+@pytest.fixture
+def driver_with_proxy(request, _proxy_session):
+    """
+    Driver configured to use mitmproxy (PROXY_CONFIG)
+    Allows selective mocking and recording
 
-    driver = webdriver.Remote(
-        "http://appium-android:4723",
-        options=options
-    )
+    Shares a session within a class like driver_direct_mock.
+    """
+    yield _proxy_session
+    _relaunch_app(request, _proxy_session, _PROXY_LAUNCH)
 
-    yield driver
-    driver.quit()
+
+@pytest.fixture(scope="session")
+def products_data(http, mockoon_url):
+    """
+    Parsed /api/v1/products payload, fetched once per session
+
+    Shared by every test that inspects the product list so the endpoint
+    is downloaded and parsed a single time.
+    """
+    response = http.get(f"{mockoon_url}/api/v1/products")
+    assert response.status_code == 200
+    return response.json()
 
 
+@pytest.mark.ui_screenshot("driver_direct_mock")
 class TestDirectMock:
     """Tests using direct Mockoon access"""
 
-    def test_verify_mock_endpoint(self, mockoon_url):
+    def test_verify_mock_endpoint(self, products_data):
         """Verify Mockoon is responding correctly"""
-        response = requests.get(f"{mockoon_url}/api/v1/products")
-
-        assert response.status_code == 200
-        data = response.json()
+        data = products_data
         assert "products" in data
         assert len(data["products"]) == 10  # As configured in mock
 
@@ -108,7 +186,7 @@ class TestDirectMock:
         - Mockoon has /api/v1/auth/login endpoint
         - App UI elements are accessible
         """
-        wait = WebDriverWait(driver_direct_mock, 10)
+        wait = fast_wait(driver_direct_mock)
 
         # Navigate to login (adjust selectors for your app)
         # This is a placeholder - replace with your app's actual UI
@@ -139,6 +217,7 @@ class TestDirectMock:
         assert success_indicator.is_displayed()
 
 
+@pytest.mark.ui_screenshot("driver_with_proxy")
 class TestProxyMock:
     """Tests using mitmproxy for selective mocking"""
 
@@ -151,7 +230,7 @@ class TestProxyMock:
         - /api/v1/products → mocked
         - Other endpoints → real API
         """
-        wait = WebDriverWait(driver_with_proxy, 10)
+        wait = fast_wait(driver_with_proxy)
 
         # Login uses mock (fast, reliable)
         # Implementation depends on your app
@@ -178,24 +257,25 @@ class TestProxyMock:
         pass
 
 
+@pytest.mark.ui_screenshot("driver_direct_mock")
 class TestErrorScenarios:
     """Test error handling with mocked error responses"""
 
-    def test_unauthorized_error(self, driver_direct_mock, mockoon_url):
+    def test_unauthorized_error(self, driver_direct_mock, http, mockoon_url):
         """Test handling of 401 Unauthorized"""
 
         # Mockoon has a test endpoint that returns 401
-        response = requests.get(f"{mockoon_url}/api/v1/test/unauthorized")
+        response = http.get(f"{mockoon_url}/api/v1/test/unauthorized")
         assert response.status_code == 401
 
         # Now test app handles it correctly
         # (implementation depends on your app)
 
-    def test_server_error(self, driver_direct_mock, mockoon_url):
+    def test_server_error(self, driver_direct_mock, http, mockoon_url):
         """Test handling of 500 Server Error"""
 
         # Mockoon has test endpoint for 500
-        response = requests.get(f"{mockoon_url}/api/v1/test/servererror")
+        response = http.get(f"{mockoon_url}/api/v1/test/servererror")
         assert response.status_code == 500
 
         # Verify app shows appropriate error message
@@ -212,18 +292,18 @@ class TestErrorScenarios:
         pass
 
 
+@pytest.mark.ui_screenshot("driver_direct_mock")
 class TestDataVariety:
     """Test with varied mock data"""
 
-    def test_product_list_rendering(self, driver_direct_mock, mockoon_url):
+    def test_product_list_rendering(self, driver_direct_mock, products_data):
         """
         Test product list with Faker.js generated data
 
         Each test run gets different fake data
         """
         # Get mock data
-        response = requests.get(f"{mockoon_url}/api/v1/products")
-        products = response.json()["products"]
+        products = products_data["products"]
 
         # Verify structure
         assert len(products) > 0
@@ -236,10 +316,10 @@ class TestDataVariety:
         # Each run will have different values thanks to Faker.js
         print(f"Testing with product: {first_product['name']}")
 
-    def test_user_profile(self, driver_direct_mock, mockoon_url):
+    def test_user_profile(self, driver_direct_mock, http, mockoon_url):
         """Test profile screen with fake user data"""
 
-        response = requests.get(f"{mockoon_url}/api/v1/user/profile")
+        response = http.get(f"{mockoon_url}/api/v1/user/profile")
         user = response.json()
 
         # Verify structure
@@ -251,52 +331,76 @@ class TestDataVariety:
         print(f"Testing with user: {user['firstName']} {user['email']}")
 
 
-@pytest.mark.parametrize("scenario", [
-    "success",
-    "invalid_credentials",
-    "server_error"
-])
-def test_login_scenarios(scenario, mockoon_url):
+# Login scenarios: name -> (method, endpoint, JSON body)
+LOGIN_SCENARIOS = {
+    # Call normal login endpoint
+    "success": ("POST", "/api/v1/auth/login", {"email": "test@test.com", "password": "correct"}),
+    # Mockoon response rules can return different responses
+    "invalid_credentials": ("POST", "/api/v1/auth/login", {"email": "test@test.com", "password": "wrong"}),
+    # Use test endpoint
+    "server_error": ("GET", "/api/v1/test/servererror", None),
+}
+
+
+@pytest.fixture(scope="module")
+def login_scenario_responses(http, mockoon_url):
+    """
+    Fire every login scenario request at once
+
+    The requests are independent, so sending them concurrently costs one
+    round-trip instead of one per scenario. Each parametrized test then
+    checks its own response.
+    """
+    with ThreadPoolExecutor(max_workers=len(LOGIN_SCENARIOS)) as pool:
+        futures = {
+            name: pool.submit(http.request, method, f"{mockoon_url}{endpoint}", json=body)
+            for name, (method, endpoint, body) in LOGIN_SCENARIOS.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+@pytest.mark.parametrize("scenario", list(LOGIN_SCENARIOS))
+def test_login_scenarios(scenario, login_scenario_responses):
     """
     Test different login scenarios
 
     This demonstrates how to test multiple scenarios
     by calling different mock endpoints or using response rules
     """
+    response = login_scenario_responses[scenario]
 
     if scenario == "success":
-        # Call normal login endpoint
-        response = requests.post(
-            f"{mockoon_url}/api/v1/auth/login",
-            json={"email": "test@test.com", "password": "correct"}
-        )
         assert response.status_code == 200
         assert "token" in response.json()
 
     elif scenario == "invalid_credentials":
-        # Mockoon response rules can return different responses
-        response = requests.post(
-            f"{mockoon_url}/api/v1/auth/login",
-            json={"email": "test@test.com", "password": "wrong"}
-        )
         assert response.status_code == 401
 
     elif scenario == "server_error":
-        # Use test endpoint
-        response = requests.get(f"{mockoon_url}/api/v1/test/servererror")
         assert response.status_code == 500
 
 
 # Utility functions
 
+def fast_wait(driver, timeout=10):
+    """Explicit wait that polls every WAIT_POLL_FREQUENCY seconds"""
+    return WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=WAIT_POLL_FREQUENCY,
+        ignored_exceptions=(NoSuchElementException,)
+    )
+
+
 def verify_mock_data_structure(data, expected_fields):
     """Helper to verify mock data has expected structure"""
     for field in expected_fields:
         assert field in data, f"Missing field: {field}"
 
 
-def get_mock_response(endpoint, mockoon_url="http://mockoon:3000"):
-    """Helper to get data from mock API"""
-    response = requests.get(f"{mockoon_url}{endpoint}")
+def get_mock_response(endpoint, mockoon_url="http://mockoon:3000", session=None):
+    """Helper to get data from mock API, reusing session when given"""
+    client = session if session is not None else requests
+    response = client.get(f"{mockoon_url}{endpoint}")
     response.raise_for_status()
     return response.json()
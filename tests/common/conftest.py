@@ -7,7 +7,7 @@ all test files.
 
 import pytest
 import requests
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 # API Configuration
@@ -16,6 +16,16 @@ MITMPROXY_URL = "http://mitmproxy:8080"
 APPIUM_ANDROID_URL = "http://appium-android:4723"
 APPIUM_IOS_URL = "http://localhost:4724"
 
+# Service health checks: name -> (URL, expected status or None for any 2xx/3xx)
+HEALTH_CHECKS = {
+    "mockoon": (f"{MOCKOON_URL}/api/v1/products", 200),
+    "mitmproxy": ("http://mitmproxy:8081", None),
+}
+
+# (connect, read) timeout for health checks: a stopped container refuses
+# or drops the connection immediately, so there's no point waiting longer
+HEALTH_CHECK_TIMEOUT = (0.5, 2.0)
+
 
 def pytest_addoption(parser):
     """Add custom command line options"""
@@ -57,24 +67,44 @@ def mockoon_url():
     return MOCKOON_URL
 
 
-@pytest.fixture(scope="session")
-def verify_mockoon():
-    """Verify Mockoon is accessible"""
+def _check_service(http, url, expected_status):
+    """Return True if the service at url answers as expected"""
     try:
-        response = requests.get(f"{MOCKOON_URL}/api/v1/products", timeout=5)
-        return response.status_code == 200
-    except:
+        response = http.get(url, timeout=HEALTH_CHECK_TIMEOUT)
+    except requests.RequestException:
         return False
 
+    if expected_status is None:
+        return response.ok
+    return response.status_code == expected_status
+
+
+@pytest.fixture(scope="session")
+def service_health(http):
+    """
+    Check all services concurrently, once per session
+
+    Returns a dict like {"mockoon": True, "mitmproxy": False}. Probes run
+    in parallel so unreachable services don't add up their timeouts.
+    """
+    with ThreadPoolExecutor(max_workers=len(HEALTH_CHECKS)) as pool:
+        futures = {
+            pool.submit(_check_service, http, url, expected): name
+            for name, (url, expected) in HEALTH_CHECKS.items()
+        }
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
+
+@pytest.fixture(scope="session")
+def verify_mockoon(service_health):
+    """Verify Mockoon is accessible"""
+    return service_health["mockoon"]
+
 
 @pytest.fixture(scope="session")
-def verify_mitmproxy():
+def verify_mitmproxy(service_health):
     """Verify mitmproxy is accessible"""
-    try:
-        response = requests.get("http://mitmproxy:8081", timeout=5)
-        return response.ok
-    except:
-        return False
+    return service_health["mitmproxy"]
 
 
 @pytest.fixture
@@ -123,66 +153,25 @@ def api_base_url(api_mode, mockoon_url):
         raise ValueError(f"Unknown api_mode: {api_mode}")
 
 
-@pytest.fixture(autouse=True)
-def screenshot_on_failure(request):
-    """
-    Automatically take screenshot on test failure
-
-    This fixture runs for every test and captures a screenshot
-    if the test fails.
-    """
-    yield
-
-    # Check if test failed
-    if hasattr(request.node, 'rep_call') and request.node.rep_call.failed:
-        # Get driver from test if it exists
-        if 'driver' in request.fixturenames:
-            driver = request.getfixturevalue('driver')
-
-            # Generate screenshot filename
-            test_name = request.node.name
-            screenshot_path = Path("/app/results/screenshots") / f"{test_name}_failure.png"
-            screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-
-            try:
-                driver.save_screenshot(str(screenshot_path))
-                print(f"\nScreenshot saved: {screenshot_path}")
-            except Exception as e:
-                print(f"\nFailed to capture screenshot: {e}")
-
-
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    """
-    Hook to capture test results for screenshot_on_failure
-
-    This makes the test result available to fixtures
-    """
-    outcome = yield
-    rep = outcome.get_result()
-
-    # Store result in the item for use by fixtures
-    setattr(item, f"rep_{rep.when}", rep)
-
-
 @pytest.fixture
-def mock_api_client(mockoon_url):
+def mock_api_client(mockoon_url, http):
     """
     Simple client for interacting with mock API
 
     Useful for verifying mock responses before running UI tests
     """
     class MockAPIClient:
-        def __init__(self, base_url):
+        def __init__(self, base_url, session):
             self.base_url = base_url
+            self.session = session
 
         def get(self, endpoint):
-            response = requests.get(f"{self.base_url}{endpoint}")
+            response = self.session.get(f"{self.base_url}{endpoint}")
             response.raise_for_status()
             return response.json()
 
         def post(self, endpoint, data):
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}{endpoint}",
                 json=data
             )
@@ -190,10 +179,10 @@ def mock_api_client(mockoon_url):
             return response.json()
 
         def verify_endpoint(self, endpoint, expected_status=200):
-            response = requests.get(f"{self.base_url}{endpoint}")
+            response = self.session.get(f"{self.base_url}{endpoint}")
             return response.status_code == expected_status
 
-    return MockAPIClient(mockoon_url)
+    return MockAPIClient(mockoon_url, http)
 
 
 # Example usage in tests:
@@ -0,0 +1,82 @@
+"""
+Pytest fixtures and hooks shared by every mobile test directory
+
+Fixtures and hooks here are visible to tests/android, tests/ios and
+tests/common, so they are configured in one place.
+"""
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pathlib import Path
+
+
+# Where failure screenshots of UI tests are written
+SCREENSHOT_DIR = Path("/app/results/screenshots")
+
+
+@pytest.fixture(scope="session")
+def http():
+    """
+    Shared HTTP session for calls to the mock services
+
+    Reusing one session keeps connections alive across tests instead
+    of opening a new TCP connection for every request.
+    """
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=0, connect=0, read=0),
+    ))
+    session.headers["Connection"] = "keep-alive"
+    yield session
+    session.close()
+
+
+def pytest_configure(config):
+    """Register custom markers"""
+    config.addinivalue_line(
+        "markers",
+        "ui_screenshot(fixture): screenshot the given driver fixture on failure "
+        "(tests using a fixture named 'driver' are covered automatically)"
+    )
+
+
+def _save_failure_screenshot(item):
+    """Save a screenshot from the test's driver, if it has one"""
+    marker = item.get_closest_marker("ui_screenshot")
+    fixture_name = marker.args[0] if marker and marker.args else "driver"
+
+    driver = item.funcargs.get(fixture_name)
+    if driver is None:
+        return
+
+    screenshot_path = SCREENSHOT_DIR / f"{item.name}_failure.png"
+    screenshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        driver.save_screenshot(str(screenshot_path))
+        print(f"\nScreenshot saved: {screenshot_path}")
+    except Exception as e:
+        print(f"\nFailed to capture screenshot: {e}")
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Hook to capture test results and screenshot UI test failures
+
+    Screenshots are taken here rather than in an autouse fixture, so
+    tests without a driver pay nothing extra. The result is also stored
+    on the item (rep_setup, rep_call, ...) for use by fixtures.
+    """
+    outcome = yield
+    rep = outcome.get_result()
+
+    # Store result in the item for use by fixtures
+    setattr(item, f"rep_{rep.when}", rep)
+
+    if rep.when == "call" and rep.failed:
+        _save_failure_screenshot(item)
@@ -12,32 +12,47 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
-@pytest.fixture
-def driver():
-    """Setup Appium driver for iOS"""
-    options = XCUITestOptions()
-    options.platform_name = "iOS"
-    options.automation_name = "XCUITest"
-    options.device_name = "iPhone SE"
+# Driver options are built once at import; the fixture only opens the session
+_OPTIONS = XCUITestOptions()
+_OPTIONS.platform_name = "iOS"
+_OPTIONS.automation_name = "XCUITest"
+_OPTIONS.device_name = "iPhone SE"
+
+# TODO: Update with your app details
+# _OPTIONS.bundle_id = "com.example.yourapp"
+
+# For testing Safari browser
+_OPTIONS.browser_name = "Safari"
 
-    # TODO: Update with your app details
-    # options.bundle_id = "com.example.yourapp"
+_OPTIONS.no_reset = True
+_OPTIONS.new_command_timeout = 300
 
-    # For testing Safari browser
-    options.browser_name = "Safari"
 
-    options.no_reset = True
-    options.new_command_timeout = 300
+@pytest.fixture(scope="session")
+def driver():
+    """
+    Setup Appium driver for iOS
 
+    One session is shared by every test; _reset_browser clears state
+    between tests instead of starting a new session.
+    """
     driver = webdriver.Remote(
         "http://localhost:4724",
-        options=options
+        options=_OPTIONS
     )
 
     yield driver
     driver.quit()
 
 
+@pytest.fixture(autouse=True)
+def _reset_browser(driver):
+    """Clear browser state after each test"""
+    yield
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
 def test_example(driver):
     """Example test - opens Apple website"""
     driver.get("https://www.apple.com")